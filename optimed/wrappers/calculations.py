@@ -1,10 +1,9 @@
-from typing import Tuple
+from typing import Tuple, Union, Sequence
 import numpy as np
 import warnings
 import importlib
-
-# Check if cupy is available
-_cupy_available = importlib.util.find_spec("cupy") is not None
+import importlib.util
+from collections import namedtuple
 
 from scipy.ndimage import label as _scipy_label_cpu
 from scipy.ndimage import binary_dilation as _scipy_binary_dilation_cpu
@@ -13,20 +12,98 @@ from scipy.ndimage import binary_erosion as _scipy_binary_erosion_cpu
 from scipy.ndimage import distance_transform_edt as _scipy_distance_transform_edt_cpu
 from scipy.ndimage import minimum as _scipy_minimum_cpu
 from scipy.ndimage import sum as _scipy_sum_cpu
+from scipy.signal import fftconvolve as _fftconvolve_cpu
+
+# Check if cupy is available without importing it; cupy and its GPU-enabled
+# scipy.ndimage functions are imported on the first GPU call.
+_cupy_available = importlib.util.find_spec("cupy") is not None
+cp = None
+_cupyx_ndimage = None
+
+
+def _load_cupy() -> bool:
+    """
+    Imports cupy and cupyx.scipy.ndimage on first use.
+    Returns False (and falls back to CPU from then on) if cupy cannot be imported.
+    """
+    global cp, _cupyx_ndimage, _cupy_available
+    if cp is None and _cupy_available:
+        try:
+            cp = importlib.import_module("cupy")
+            _cupyx_ndimage = importlib.import_module("cupyx.scipy.ndimage")
+        except ImportError:
+            cp = None
+            _cupy_available = False
+    return cp is not None
 
-# Try to import cupy and its GPU-enabled scipy.ndimage functions.
+# Numba is optional; without it the CPU paths fall back to NumPy.
 try:
-    import cupy as cp
-    from cupyx.scipy.ndimage import label as _scipy_label_gpu
-    from cupyx.scipy.ndimage import binary_dilation as _scipy_binary_dilation_gpu
-    from cupyx.scipy.ndimage import binary_closing as _scipy_binary_closing_gpu
-    from cupyx.scipy.ndimage import binary_erosion as _scipy_binary_erosion_gpu
-    from cupyx.scipy.ndimage import distance_transform_edt as _scipy_distance_transform_edt_gpu
-    from cupyx.scipy.ndimage import minimum as _scipy_minimum_gpu
-    from cupyx.scipy.ndimage import sum as _scipy_sum_gpu
-except ImportError as exc:
-    # Fallback to CPU versions
-    _cupy_available = None
+    from numba import njit, prange
+    _numba_available = True
+except ImportError:
+    _numba_available = False
+
+# Shared non-blocking streams, one per CUDA device id.
+_streams = {}
+
+
+def _gpu_stream():
+    """
+    Returns the non-blocking CUDA stream shared by all GPU wrappers on the
+    current device. Streams are created on first use, so importing this module
+    does not initialise CUDA, and per device, since a stream cannot launch
+    kernels on another device.
+    A non-blocking stream does not synchronise with the legacy default stream,
+    so it is made to wait for the caller's current stream: CuPy arrays the
+    caller produced there are complete before the wrapper reads them.
+    Must be called before entering the stream's context.
+    """
+    device_id = cp.cuda.Device().id
+    stream = _streams.get(device_id)
+    if stream is None:
+        stream = _streams[device_id] = cp.cuda.Stream(non_blocking=True)
+    stream.wait_event(cp.cuda.get_current_stream().record())
+    return stream
+
+
+def _release_to_caller(stream):
+    """
+    Makes the caller's current stream wait for the work queued on 'stream'.
+    In-place wrappers return CuPy arrays that are still being written on the
+    shared stream; this orders any later use of them on the caller's stream
+    after that work, without blocking the host. Must be called after leaving
+    the stream's context.
+    """
+    cp.cuda.get_current_stream().wait_event(stream.record())
+
+
+def _to_gpu(array):
+    """
+    Copies a host array to the GPU on the current stream without blocking.
+    CuPy stages the copy through its pinned memory pool and keeps the staging
+    buffer alive until the copy completes. CuPy arrays are returned unchanged.
+    """
+    return cp.asarray(array, blocking=False)
+
+
+def _prepare(xp_local, array, dtype=None):
+    """
+    Returns 'array' as a C-contiguous array of 'dtype' (default: its own dtype).
+    The input is not copied when already C-contiguous of the expected dtype.
+    """
+    array = xp_local.asarray(array)
+    dtype = array.dtype if dtype is None else xp_local.dtype(dtype)
+    if array.flags.c_contiguous and array.dtype == dtype:
+        return array
+    return xp_local.ascontiguousarray(array, dtype=dtype)
+
+
+def _is_gpu_array(array) -> bool:
+    """
+    Returns True if 'array' is a CuPy array.
+    """
+    return type(array).__module__.startswith("cupy") and _load_cupy() and isinstance(array, cp.ndarray)
+
 
 def _ensure_numpy(array):
     """
@@ -38,29 +115,314 @@ def _ensure_numpy(array):
     return array
 
 
-def scipy_label(input: np.ndarray, structure: np.ndarray = None, use_gpu: bool = True) -> Tuple[np.ndarray, int]:
+# Block-Based Komura Equivalence (BKE) connected-component labeling
+# (Bolelli et al.). Each thread owns a 2x2 pixel block, so a 16x16 thread
+# block covers a 32x32 pixel tile. Union-find runs on block indices.
+_BKE_KERNEL_SOURCE = r"""
+#define BKE_TILE 32
+
+extern "C" {
+
+__device__ int bke_find(const int* parent, int n) {
+    while (parent[n] != n) {
+        n = parent[n];
+    }
+    return n;
+}
+
+__device__ void bke_union(int* parent, int a, int b) {
+    bool done;
+    do {
+        a = bke_find(parent, a);
+        b = bke_find(parent, b);
+        if (a < b) {
+            int old = atomicMin(&parent[b], a);
+            done = (old == b);
+            b = old;
+        } else if (b < a) {
+            int old = atomicMin(&parent[a], b);
+            done = (old == a);
+            a = old;
+        } else {
+            done = true;
+        }
+    } while (!done);
+}
+
+__global__ void bke_init(int* parent, int bh, int bw) {
+    int bc = blockIdx.x * blockDim.x + threadIdx.x;
+    int br = blockIdx.y * blockDim.y + threadIdx.y;
+    if (br < bh && bc < bw) {
+        parent[br * bw + bc] = br * bw + bc;
+    }
+}
+
+__global__ void bke_merge(const unsigned char* img, int* parent, int h, int w, int bh, int bw) {
+    // Pixel tile plus one row above and one column on each side.
+    __shared__ unsigned char tile[BKE_TILE + 1][BKE_TILE + 2];
+    int y0 = blockIdx.y * BKE_TILE - 1;
+    int x0 = blockIdx.x * BKE_TILE - 1;
+    int tid = threadIdx.y * blockDim.x + threadIdx.x;
+    for (int i = tid; i < (BKE_TILE + 1) * (BKE_TILE + 2); i += blockDim.x * blockDim.y) {
+        int ty = i / (BKE_TILE + 2);
+        int tx = i % (BKE_TILE + 2);
+        int y = y0 + ty;
+        int x = x0 + tx;
+        tile[ty][tx] = (y >= 0 && y < h && x >= 0 && x < w) ? img[y * w + x] : 0;
+    }
+    __syncthreads();
+
+    int bc = blockIdx.x * blockDim.x + threadIdx.x;
+    int br = blockIdx.y * blockDim.y + threadIdx.y;
+    if (br >= bh || bc >= bw) {
+        return;
+    }
+
+    int ly = 2 * threadIdx.y + 1;
+    int lx = 2 * threadIdx.x + 1;
+    unsigned char a = tile[ly][lx];
+    unsigned char b = tile[ly][lx + 1];
+    unsigned char c = tile[ly + 1][lx];
+    unsigned char d = tile[ly + 1][lx + 1];
+    if (!(a | b | c | d)) {
+        return;
+    }
+
+    int self = br * bw + bc;
+    // Left block: its right column touches our left column.
+    if (bc > 0 && (a | c) && (tile[ly][lx - 1] | tile[ly + 1][lx - 1])) {
+        bke_union(parent, self, self - 1);
+    }
+    if (br > 0) {
+        // Upper block: its bottom row touches our top row.
+        if ((a | b) && (tile[ly - 1][lx] | tile[ly - 1][lx + 1])) {
+            bke_union(parent, self, self - bw);
+        }
+        // Upper-left and upper-right blocks touch through a single corner pixel.
+        if (bc > 0 && a && tile[ly - 1][lx - 1]) {
+            bke_union(parent, self, self - bw - 1);
+        }
+        if (bc + 1 < bw && b && tile[ly - 1][lx + 2]) {
+            bke_union(parent, self, self - bw + 1);
+        }
+    }
+}
+
+__global__ void bke_compress(int* parent, int n) {
+    int i = blockIdx.x * blockDim.x + threadIdx.x;
+    if (i < n) {
+        parent[i] = bke_find(parent, i);
+    }
+}
+
+__global__ void bke_relabel(const unsigned char* __restrict__ img, const int* __restrict__ parent,
+                            int* out, int h, int w, int bh, int bw) {
+    int bc = blockIdx.x * blockDim.x + threadIdx.x;
+    int br = blockIdx.y * blockDim.y + threadIdx.y;
+    if (br >= bh || bc >= bw) {
+        return;
+    }
+    int root = __ldg(&parent[br * bw + bc]) + 1;
+    int y = 2 * br;
+    int x = 2 * bc;
+    for (int dy = 0; dy < 2 && y + dy < h; ++dy) {
+        for (int dx = 0; dx < 2 && x + dx < w; ++dx) {
+            int i = (y + dy) * w + x + dx;
+            out[i] = __ldg(&img[i]) ? root : 0;
+        }
+    }
+}
+
+}
+"""
+
+_bke_module = None
+
+
+def _get_bke_module():
+    """
+    Compiles the BKE kernels on first use and caches the resulting module.
+    """
+    global _bke_module
+    if _bke_module is None:
+        _bke_module = cp.RawModule(code=_BKE_KERNEL_SOURCE)
+    return _bke_module
+
+
+def _bke_label_gpu(input) -> Tuple["cp.ndarray", int]:
+    """
+    Labels 8-connected components of a 2D array on the GPU using BKE.
+    Labels are compacted to 1..n in raster order of their root blocks.
+    """
+    if input.size == 0:
+        return cp.zeros(input.shape, dtype=cp.int32), 0
+    module = _get_bke_module()
+    img = cp.ascontiguousarray(input != 0, dtype=cp.uint8)
+    h, w = img.shape
+    bh, bw = (h + 1) // 2, (w + 1) // 2
+    n_blocks = bh * bw
+
+    parent = cp.empty(n_blocks, dtype=cp.int32)
+    labels = cp.empty((h, w), dtype=cp.int32)
+    block = (16, 16)
+    grid = ((bw + block[0] - 1) // block[0], (bh + block[1] - 1) // block[1])
+    h, w, bh, bw = np.int32(h), np.int32(w), np.int32(bh), np.int32(bw)
+
+    module.get_function("bke_init")(grid, block, (parent, bh, bw))
+    module.get_function("bke_merge")(grid, block, (img, parent, h, w, bh, bw))
+    module.get_function("bke_compress")(((n_blocks + 255) // 256,), (256,), (parent, np.int32(n_blocks)))
+    module.get_function("bke_relabel")(grid, block, (img, parent, labels, h, w, bh, bw))
+
+    # Roots are block indices; compact them to consecutive labels.
+    uniq, inverse = cp.unique(labels, return_inverse=True)
+    inverse = inverse.reshape(labels.shape).astype(cp.int32, copy=False)
+    if int(uniq[0]) != 0:
+        # No background pixels: shift so that the first component is 1.
+        return inverse + 1, int(uniq.size)
+    return inverse, int(uniq.size) - 1
+
+
+def scipy_label(
+        input: np.ndarray,
+        structure: np.ndarray = None,
+        use_gpu: bool = True,
+        backend: str = "scipy") -> Tuple[np.ndarray, int]:
     """
     Labels connected components in the input array.
     Uses GPU acceleration if available and requested.
 
+    On the GPU, backend="bke" labels 2D arrays with a Block-Based Komura
+    Equivalence kernel instead of cupyx.scipy.ndimage.label. BKE only supports
+    8-connectivity, so structure must be np.ones((3, 3)).
+
     Returns:
         Tuple[np.ndarray, int]: (labeled array, number of labels)
     """
-    if not use_gpu or not _cupy_available:
+    if backend not in ("scipy", "bke"):
+        raise ValueError("Unsupported backend. Use 'scipy' or 'bke'.")
+
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
         input = np.asarray(input)
         structure = np.asarray(structure) if structure is not None else None
         return _scipy_label_cpu(input, structure)
+    elif backend == "bke":
+        with _gpu_stream():
+            input = _to_gpu(input)
+            if input.ndim != 2:
+                raise ValueError("The 'bke' backend supports only 2D arrays.")
+            if structure is None or np.shape(structure) != (3, 3) or not np.all(_ensure_numpy(structure)):
+                raise ValueError("The 'bke' backend supports only 8-connectivity (structure=np.ones((3, 3))).")
+            components, num_labels = _bke_label_gpu(input)
+            return _ensure_numpy(components), num_labels
     else:
-        input = cp.asarray(input)
-        structure = cp.asarray(structure) if structure is not None else None
-        components, num_labels = _scipy_label_gpu(input, structure)
-        return _ensure_numpy(components), num_labels
+        with _gpu_stream():
+            input = _to_gpu(input)
+            structure = _to_gpu(structure) if structure is not None else None
+            components, num_labels = _cupyx_ndimage.label(input, structure)
+            return _ensure_numpy(components), num_labels
+
+
+# Structures with at least this many elements are dilated on the CPU via FFT
+# convolution, whose cost does not grow with the structure size. Measured on
+# 1024x1024 masks, FFT only beats scipy from about 15x15 upward; below that,
+# and for its float64/complex temporaries, scipy is the better choice.
+_FFT_DILATION_MIN_STRUCTURE_SIZE = 225
+
+
+def _fft_binary_dilation_cpu(input: np.ndarray, structure: np.ndarray, iterations: int) -> np.ndarray:
+    """
+    Binary dilation computed as (input * structure) > 0.5 with scipy's fftconvolve.
+    Matches scipy.ndimage.binary_dilation for odd-shaped, centered structures.
+    Only a single iteration, or a box structure, is supported: repeated
+    dilation by a box is a single dilation by a larger box.
+    """
+    kernel = (structure != 0).astype(np.float64)
+    if iterations > 1:
+        kernel = np.ones(tuple(iterations * (s - 1) + 1 for s in kernel.shape), dtype=np.float64)
+
+    return _fftconvolve_cpu((input != 0).astype(np.float64), kernel, mode="same") > 0.5
+
+
+def _binary_dilation_3x3_bitpacked(input: np.ndarray, iterations: int) -> np.ndarray:
+    """
+    Dilates a 2D boolean array by a 3x3 box with rows packed 64 pixels per uint64,
+    so each neighbour is a single shift + OR per word.
+    """
+    h, w = input.shape
+    n_bytes = -(-w // 64) * 8
+
+    def pack(a):
+        packed = np.packbits(a, axis=-1, bitorder="little")
+        packed = np.pad(packed, ((0, 0), (0, n_bytes - packed.shape[-1])))
+        return np.ascontiguousarray(packed).view("<u8")
+
+    one, top = np.uint64(1), np.uint64(63)
+    words = pack(input)
+    valid = pack(np.ones((1, w), dtype=bool))
+    for _ in range(iterations):
+        # Horizontal pass, carrying bits across word boundaries.
+        left = words << one
+        left[:, 1:] |= words[:, :-1] >> top
+        right = words >> one
+        right[:, :-1] |= words[:, 1:] << top
+        rows = words | left | right
+        # Vertical pass.
+        words = rows.copy()
+        words[1:] |= rows[:-1]
+        words[:-1] |= rows[1:]
+        # Clear the padding bits past the last column.
+        words &= valid
+
+    return np.unpackbits(words.view(np.uint8), axis=-1, count=w, bitorder="little").astype(bool)
+
+
+def _binary_dilation_cpu(
+        input: np.ndarray,
+        structure: np.ndarray,
+        iterations: int,
+        brute_force: bool,
+        output: np.ndarray = None) -> np.ndarray:
+    """
+    CPU dilation dispatch: FFT for large structures, bit-packed rows for a
+    3x3 box on 2D boolean inputs, scipy otherwise. Writes into 'output' if given.
+    """
+    if (structure is not None
+            and iterations >= 1
+            and structure.ndim == input.ndim
+            and structure.size >= _FFT_DILATION_MIN_STRUCTURE_SIZE
+            and all(s % 2 == 1 for s in structure.shape)
+            and (iterations == 1 or structure.all())):
+        result = _fft_binary_dilation_cpu(input, structure, iterations)
+    elif (structure is not None
+            and 1 <= iterations <= 3
+            and input.ndim == 2
+            and input.dtype == bool
+            and input.size > 0
+            and structure.shape == (3, 3)
+            and structure.all()):
+        result = _binary_dilation_3x3_bitpacked(input, iterations)
+    else:
+        # scipy stages through a temporary itself when output aliases input.
+        return _scipy_binary_dilation_cpu(input, structure, iterations, output=output, brute_force=brute_force)
+
+    if output is None:
+        return result
+    np.copyto(output, result)
+    return output
+
+
+class DilationOpts(namedtuple("DilationOpts", "structure iterations use_gpu")):
+    """
+    Reusable options for scipy_binary_dilation, passed positionally in place of
+    'structure': scipy_binary_dilation(input, DilationOpts(structure, 1, False)).
+    """
+    __slots__ = ()
 
 
 def scipy_binary_dilation(
         input: np.ndarray,
-        structure: np.ndarray = None,
+        structure: Union[np.ndarray, DilationOpts] = None,
         iterations: int = 1,
         brute_force: bool = False,
         use_gpu: bool = True) -> np.ndarray:
@@ -68,20 +430,68 @@ def scipy_binary_dilation(
     Applies binary dilation to the input array.
     Uses GPU acceleration if available and requested.
 
+    'structure' may be a DilationOpts, whose fields then replace 'structure',
+    'iterations' and 'use_gpu'.
+
+    On the CPU, odd-shaped structures with at least 225 elements (only boxes
+    when iterations > 1) are applied through FFT convolution instead of
+    scipy.ndimage.binary_dilation, and 2D boolean inputs dilated by a 3x3 box
+    (up to 3 iterations) use bit-packed rows.
+
     Returns:
         np.ndarray: The dilated array.
     """
-    if not use_gpu or not _cupy_available:
+    if isinstance(structure, DilationOpts):
+        structure, iterations, use_gpu = structure
+
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
         input = np.asarray(input)
         structure = np.asarray(structure) if structure is not None else None
-        return _scipy_binary_dilation_cpu(input, structure, iterations, brute_force=brute_force)
+        return _binary_dilation_cpu(input, structure, iterations, brute_force)
     else:
-        input = cp.asarray(input)
-        structure = cp.asarray(structure) if structure is not None else None
-        result = _scipy_binary_dilation_gpu(input, structure, iterations, brute_force=brute_force)
-        return _ensure_numpy(result)
-    
+        with _gpu_stream():
+            input = _to_gpu(input)
+            structure = _to_gpu(structure) if structure is not None else None
+            result = _cupyx_ndimage.binary_dilation(input, structure, iterations, brute_force=brute_force)
+            return _ensure_numpy(result)
+
+
+def scipy_binary_dilation_(
+        input: np.ndarray,
+        structure: Union[np.ndarray, DilationOpts] = None,
+        iterations: int = 1,
+        brute_force: bool = False,
+        use_gpu: bool = True) -> np.ndarray:
+    """
+    In-place variant of scipy_binary_dilation: the dilated mask is written back
+    into 'input', which must be a boolean NumPy array. CuPy arrays are always
+    processed on the GPU without leaving the device.
+
+    Returns:
+        np.ndarray: 'input', holding the dilated array.
+    """
+    if isinstance(structure, DilationOpts):
+        structure, iterations, use_gpu = structure
+
+    if _is_gpu_array(input):
+        stream = _gpu_stream()
+        with stream:
+            structure = _to_gpu(structure) if structure is not None else None
+            input[...] = _cupyx_ndimage.binary_dilation(input, structure, iterations, brute_force=brute_force)
+        _release_to_caller(stream)
+        return input
+    if not isinstance(input, np.ndarray):
+        raise TypeError("input must be a NumPy or CuPy array.")
+
+    if not use_gpu or not _load_cupy():
+        warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
+        structure = np.asarray(structure) if structure is not None else None
+        return _binary_dilation_cpu(input, structure, iterations, brute_force, output=input)
+    else:
+        input[...] = scipy_binary_dilation(input, structure, iterations, brute_force=brute_force, use_gpu=True)
+        return input
+
 
 def scipy_binary_closing(input: np.ndarray, structure: np.ndarray = None, iterations: int = 1, use_gpu: bool = True) -> np.ndarray:
     """
@@ -91,16 +501,17 @@ def scipy_binary_closing(input: np.ndarray, structure: np.ndarray = None, iterat
     Returns:
         np.ndarray: The closed array.
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
         input = np.asarray(input)
         structure = np.asarray(structure) if structure is not None else None
         return _scipy_binary_closing_cpu(input, structure, iterations)
     else:
-        input = cp.asarray(input)
-        structure = cp.asarray(structure) if structure is not None else None
-        result = _scipy_binary_closing_gpu(input, structure, iterations)
-        return _ensure_numpy(result)
+        with _gpu_stream():
+            input = _to_gpu(input)
+            structure = _to_gpu(structure) if structure is not None else None
+            result = _cupyx_ndimage.binary_closing(input, structure, iterations)
+            return _ensure_numpy(result)
     
 
 def scipy_binary_erosion(input: np.ndarray, structure: np.ndarray = None, iterations: int = 1, use_gpu: bool = True) -> np.ndarray:
@@ -111,74 +522,393 @@ def scipy_binary_erosion(input: np.ndarray, structure: np.ndarray = None, iterat
     Returns:
         np.ndarray: The eroded array.
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
         input = np.asarray(input)
         structure = np.asarray(structure) if structure is not None else None
         return _scipy_binary_erosion_cpu(input, structure, iterations)
     else:
-        input = cp.asarray(input)
-        structure = cp.asarray(structure) if structure is not None else None
-        result = _scipy_binary_erosion_gpu(input, structure, iterations)
-        return _ensure_numpy(result)
+        with _gpu_stream():
+            input = _to_gpu(input)
+            structure = _to_gpu(structure) if structure is not None else None
+            result = _cupyx_ndimage.binary_erosion(input, structure, iterations)
+            return _ensure_numpy(result)
+
+
+# One step of a FastGeodis-style raster scan: every thread owns one element of
+# slice 'i' along the scan axis and relaxes it from the 3x3 neighbourhood of
+# the previous slice 'prev'. 2D inputs are scanned as 3D with a unit axis.
+_RASTER_SCAN_KERNEL_SOURCE = r"""
+extern "C" __global__ void raster_scan_step(
+        float* d, const float* cost, long long i, long long prev,
+        long long ss, long long la, long long na, long long lb, long long nb) {
+    long long ja = blockIdx.x * (long long)blockDim.x + threadIdx.x;
+    long long jb = blockIdx.y * (long long)blockDim.y + threadIdx.y;
+    if (ja >= na || jb >= nb) {
+        return;
+    }
+    long long cur = i * ss + ja * la + jb * lb;
+    float best = d[cur];
+    if (best == 0.0f) {
+        return;
+    }
+    for (int ka = -1; ka <= 1; ++ka) {
+        long long a = ja + ka;
+        if (a < 0 || a >= na) {
+            continue;
+        }
+        for (int kb = -1; kb <= 1; ++kb) {
+            long long b = jb + kb;
+            if (b < 0 || b >= nb) {
+                continue;
+            }
+            best = fminf(best, d[prev * ss + a * la + b * lb] + cost[(ka + 1) * 3 + kb + 1]);
+        }
+    }
+    d[cur] = best;
+}
+"""
 
+_raster_scan_kernel = None
 
-def scipy_distance_transform_edt(input: np.ndarray, sampling: Tuple[float, float] = (1, 1), use_gpu: bool = True) -> np.ndarray:
+
+def _get_raster_scan_kernel():
+    """
+    Compiles the raster-scan kernel on first use and caches it.
+    """
+    global _raster_scan_kernel
+    if _raster_scan_kernel is None:
+        _raster_scan_kernel = cp.RawKernel(_RASTER_SCAN_KERNEL_SOURCE, "raster_scan_step")
+    return _raster_scan_kernel
+
+
+def _raster_scan_edt_gpu(input, sampling) -> "cp.ndarray":
+    """
+    Approximates the Euclidean distance transform of a 2D or 3D array on the GPU
+    with forward and backward raster scans along every axis (chamfer distance
+    over the 3x3 / 3x3x3 neighbourhood). Distances are float32.
+    """
+    if input.ndim not in (2, 3):
+        raise ValueError("Approximate distance transform supports only 2D and 3D arrays.")
+    sampling = [float(s) for s in np.broadcast_to(np.asarray(sampling, dtype=np.float64), (input.ndim,))]
+
+    kernel = _get_raster_scan_kernel()
+    d = cp.where(input != 0, cp.float32(cp.inf), cp.float32(0))
+    if d.ndim == 2:
+        d = d[..., None]
+        sampling.append(1.0)
+    shape = d.shape
+    strides = [s // d.itemsize for s in d.strides]
+
+    for axis in range(3):
+        a, b = [x for x in range(3) if x != axis]
+        cost = cp.asarray([
+            np.sqrt(sampling[axis] ** 2 + (ka * sampling[a]) ** 2 + (kb * sampling[b]) ** 2)
+            for ka in (-1, 0, 1) for kb in (-1, 0, 1)
+        ], dtype=cp.float32)
+        block = (256, 1) if shape[b] == 1 else (16, 16)
+        grid = ((shape[a] + block[0] - 1) // block[0], (shape[b] + block[1] - 1) // block[1])
+        lateral = (np.int64(strides[a]), np.int64(shape[a]), np.int64(strides[b]), np.int64(shape[b]))
+        steps = [(i, i - 1) for i in range(1, shape[axis])]
+        steps += [(i, i + 1) for i in range(shape[axis] - 2, -1, -1)]
+        for i, prev in steps:
+            kernel(grid, block, (d, cost, np.int64(i), np.int64(prev), np.int64(strides[axis])) + lateral)
+
+    return d.reshape(input.shape)
+
+
+def scipy_distance_transform_edt(
+        input: np.ndarray,
+        sampling: Tuple[float, float] = (1, 1),
+        use_gpu: bool = True,
+        exact: bool = True,
+        out_dtype: np.dtype = np.float32) -> np.ndarray:
     """
     Computes the Euclidean distance transform of the input array.
     Uses GPU acceleration if available and requested.
 
+    Distances are returned as 'out_dtype'. float32 keeps about 7 significant
+    digits, which is ample for image distances, and halves memory traffic
+    compared to scipy's float64; pass out_dtype=np.float64 for scipy's dtype.
+
+    With exact=False the GPU path uses parallel raster scans (as in FastGeodis)
+    instead of cupyx.scipy.ndimage.distance_transform_edt. The result is a
+    chamfer approximation of the Euclidean distance. The CPU path is always exact.
+
     Returns:
         np.ndarray: The distance-transformed array.
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
         input = np.asarray(input)
-        return _scipy_distance_transform_edt_cpu(input, sampling)
+        result = _scipy_distance_transform_edt_cpu(input, sampling)
+        return result.astype(out_dtype, copy=False)
+    elif not exact:
+        with _gpu_stream():
+            input = _to_gpu(input)
+            result = _raster_scan_edt_gpu(input, sampling)
+            return _ensure_numpy(result.astype(out_dtype, copy=False))
     else:
-        input = cp.asarray(input)
-        result = _scipy_distance_transform_edt_gpu(input, sampling)
-        return _ensure_numpy(result)
+        with _gpu_stream():
+            input = _to_gpu(input)
+            result = _cupyx_ndimage.distance_transform_edt(input, sampling, return_distances=True, return_indices=False)
+            # Cast on the device so the copy back to the host is half the size.
+            return _ensure_numpy(result.astype(out_dtype, copy=False))
+
+
+def _as_gpu_index(index):
+    """
+    cupyx.scipy.ndimage measurements accept only a scalar or a CuPy array as
+    'index'; moves sequences of labels to the GPU.
+    """
+    if index is None or np.isscalar(index):
+        return index
+    return _to_gpu(index)
 
 
-def scipy_minimum(input: np.ndarray, labels: np.ndarray, index: int, use_gpu: bool = True) -> np.ndarray:
+def scipy_minimum(
+        input: np.ndarray,
+        labels: np.ndarray,
+        index: Union[int, Sequence[int]],
+        use_gpu: bool = True) -> np.ndarray:
     """
     Finds the minimum value of 'input' within the regions defined by 'labels' for a given index.
     Uses GPU acceleration if available and requested.
 
+    'index' may also be a list or array of labels; all of them are then
+    computed in a single pass over the arrays, which is much cheaper than
+    calling this function once per label.
+
+    Inputs are not copied when already C-contiguous.
+
     Returns:
-        np.ndarray: The minimum value (or array) for the given label.
+        np.ndarray: The minimum value for the given label, or an array of
+        minima when 'index' is a sequence.
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
-        input = np.asarray(input)
-        labels = np.asarray(labels)
+        input = _prepare(np, input)
+        labels = _prepare(np, labels)
         return _scipy_minimum_cpu(input, labels, index)
     else:
-        input = cp.asarray(input)
-        labels = cp.asarray(labels)
-        result = _scipy_minimum_gpu(input, labels, index)
-        return _ensure_numpy(result)
+        with _gpu_stream():
+            input = _prepare(cp, _to_gpu(input))
+            labels = _prepare(cp, _to_gpu(labels))
+            index = _as_gpu_index(index)
+            result = _cupyx_ndimage.minimum(input, labels, index)
+            return _ensure_numpy(result)
 
 
-def scipy_sum(input: np.ndarray, labels: np.ndarray, index: int, use_gpu: bool = True) -> np.ndarray:
+def _bincount_sum(xp_local, input, labels, index):
+    """
+    Sums integer 'input' for a sequence of labels with one bincount over the
+    ravelled arrays. Returns None when the fast path does not apply: scalar or
+    missing index, non-integer data, negative labels or indices, or labels
+    larger than the array (where the bincount table would outgrow the data).
+    """
+    if (index is None
+            or np.isscalar(index)
+            or input.dtype.kind not in "biu"
+            or labels.dtype.kind not in "iu"
+            or input.shape != labels.shape
+            or labels.size == 0):
+        return None
+    index_array = np.asarray(_ensure_numpy(index))
+    if index_array.size == 0 or int(index_array.min()) < 0:
+        return None
+    if labels.dtype.kind == "i" and int(labels.min()) < 0:
+        return None
+    max_label = int(labels.max())
+    if max_label > labels.size:
+        return None
+
+    sums = xp_local.bincount(labels.ravel(), weights=input.ravel().astype(xp_local.float64), minlength=max_label + 1)
+    # Labels that never occur sum to 0, as in scipy.
+    index_array = xp_local.asarray(index_array)
+    return xp_local.where(index_array <= max_label, sums[xp_local.minimum(index_array, max_label)], 0.0)
+
+
+def scipy_sum(
+        input: np.ndarray,
+        labels: np.ndarray,
+        index: Union[int, Sequence[int]],
+        use_gpu: bool = True) -> np.ndarray:
     """
     Computes the sum of the input values within the regions defined by 'labels' for a given index.
     Uses GPU acceleration if available and requested.
 
+    'index' may also be a list or array of labels; all sums are then computed
+    in a single pass over the arrays. For a sequence of labels, integer inputs
+    with non-negative integer labels no larger than the array size are summed
+    with a single bincount instead of scipy.ndimage.sum.
+
+    Inputs are not copied when already C-contiguous.
+
     Returns:
-        np.ndarray: The computed sum.
+        np.ndarray: The computed sum, or an array of sums when 'index' is a sequence.
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
-        input = np.asarray(input)
-        labels = np.asarray(labels)
+        input = _prepare(np, input)
+        labels = _prepare(np, labels)
+        result = _bincount_sum(np, input, labels, index)
+        if result is not None:
+            return result
         return _scipy_sum_cpu(input, labels, index)
     else:
-        input = cp.asarray(input)
-        labels = cp.asarray(labels)
-        result = _scipy_sum_gpu(input, labels, index)
-        return _ensure_numpy(result)
+        with _gpu_stream():
+            input = _prepare(cp, _to_gpu(input))
+            labels = _prepare(cp, _to_gpu(labels))
+            result = _bincount_sum(cp, input, labels, index)
+            if result is not None:
+                return _ensure_numpy(result)
+            index = _as_gpu_index(index)
+            result = _cupyx_ndimage.sum(input, labels, index)
+            return _ensure_numpy(result)
+
+
+# Up to this many labels, chained equality tests beat isin's sort overhead.
+_ISIN_CHAIN_MAX_LABELS = 4
+
+
+def _representable_labels(dtype, lbls) -> list:
+    """
+    Drops labels that cannot occur in an array of 'dtype', so that casting the
+    keep-list to the mask's dtype can neither overflow nor wrap around.
+    """
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        return [l for l in lbls if info.min <= l <= info.max]
+    if dtype.kind == "b":
+        return [l for l in lbls if l in (0, 1)]
+    return list(lbls)
+
+
+def _isin(xp_local, mask, lbls: list):
+    """
+    Returns a boolean array marking the elements of 'mask' whose values are in 'lbls'.
+    """
+    if len(lbls) <= _ISIN_CHAIN_MAX_LABELS:
+        hit = xp_local.zeros(mask.shape, dtype=bool)
+        for l in lbls:
+            hit |= mask == l
+        return hit
+    return xp_local.isin(mask, xp_local.asarray(lbls, dtype=mask.dtype))
+
+
+def _label_lut(xp_local, mask, lbls: list, dtype, kept, dropped):
+    """
+    Returns a 'dtype' lookup table mapping each value of 'mask' to 'kept' (or
+    to itself when 'kept' is None) if it is in 'lbls' and to 'dropped'
+    otherwise. Returns None when 'mask' is not a non-negative integer array
+    whose maximum does not exceed its size.
+    """
+    if (mask.dtype.kind not in "iu"
+            or mask.size == 0
+            or any(l < 0 for l in lbls)
+            or (mask.dtype.kind == "i" and int(mask.min()) < 0)):
+        return None
+    max_val = int(mask.max())
+    if max_val > mask.size:
+        return None
+    keep = xp_local.asarray([l for l in lbls if l <= max_val], dtype=xp_local.intp)
+    lut = xp_local.full(max_val + 1, dropped, dtype=dtype)
+    lut[keep] = kept if kept is not None else keep.astype(lut.dtype)
+    return lut
+
+
+def _filter_labels(xp_local, mask, lbls: list):
+    """
+    Returns a copy of 'mask' with every value not in 'lbls' set to 0.
+
+    Non-negative integer masks whose maximum does not exceed their size use a
+    single lookup-table gather, whose cost does not depend on len(lbls).
+    Negative or sparse label values fall back to an isin test.
+    """
+    lbls = _representable_labels(mask.dtype, lbls)
+    lut = _label_lut(xp_local, mask, lbls, mask.dtype, None, 0)
+    if lut is not None:
+        return lut[mask]
+    keep = _isin(xp_local, mask, lbls)
+    return xp_local.where(keep, mask, mask.dtype.type(0))
+
+
+def _filter_labels_(xp_local, mask, lbls: list):
+    """
+    In-place variant of _filter_labels: gathers a boolean keep-mask, a quarter
+    of the size of an int32 mask, and multiplies 'mask' by it in place instead
+    of building a filtered copy.
+    """
+    lbls = _representable_labels(mask.dtype, lbls)
+    lut = _label_lut(xp_local, mask, lbls, bool, True, False)
+    keep = lut.take(mask) if lut is not None else _isin(xp_local, mask, lbls)
+    if mask.dtype.kind in "biu":
+        xp_local.multiply(mask, keep, out=mask)
+    else:
+        # NaN and inf do not become 0 when multiplied by it.
+        xp_local.copyto(mask, mask.dtype.type(0), where=~keep)
+    return mask
+
+
+# Largest keep-list handled by the fused Numba kernel in filter_mask.
+_NUMBA_FILTER_MAX_LABELS = 8
+
+if _numba_available:
+    @njit(parallel=True, cache=True)
+    def _filter_mask_numba(mask, keep, out):
+        """
+        Fused membership test and write over flat int32 arrays:
+        out[i] = mask[i] if mask[i] is in keep, else 0.
+        """
+        for i in prange(mask.size):
+            v = mask[i]
+            found = False
+            for k in range(keep.size):
+                found |= v == keep[k]
+            out[i] = v if found else 0
+
+
+_FILTER_MASK_KERNEL_SOURCE = r"""
+extern "C" __global__ void filter_mask_k(const int* m, const int* keep, int K, int* out, long long N) {
+    long long i = blockIdx.x * (long long)blockDim.x + threadIdx.x;
+    if (i >= N) {
+        return;
+    }
+    int v = m[i];
+    int hit = 0;
+    #pragma unroll 8
+    for (int j = 0; j < K; ++j) {
+        hit |= (v == keep[j]);
+    }
+    out[i] = hit ? v : 0;
+}
+"""
+
+_filter_mask_kernel = None
+
+
+def _get_filter_mask_kernel():
+    """
+    Compiles the filter_mask kernel on first use and caches it.
+    """
+    global _filter_mask_kernel
+    if _filter_mask_kernel is None:
+        _filter_mask_kernel = cp.RawKernel(_FILTER_MASK_KERNEL_SOURCE, "filter_mask_k")
+    return _filter_mask_kernel
+
+
+def _filter_mask_gpu_int32(mask, lbls: list, out=None) -> "cp.ndarray":
+    """
+    Filters a C-contiguous int32 CuPy mask with one fused kernel launch.
+    'out' may be 'mask' itself: every thread reads its element before writing it.
+    """
+    keep = _to_gpu(np.asarray(lbls, dtype=np.int32))
+    if out is None:
+        out = cp.empty_like(mask)
+    n = mask.size
+    if n:
+        _get_filter_mask_kernel()(((n + 255) // 256,), (256,), (mask, keep, np.int32(keep.size), out, np.int64(n)))
+    return out
 
 
 def filter_mask(mask: np.ndarray, lbls: list, use_gpu: bool = True, verbose: bool = True) -> np.ndarray:
@@ -186,22 +916,69 @@ def filter_mask(mask: np.ndarray, lbls: list, use_gpu: bool = True, verbose: boo
     Retains only the pixels in 'mask' whose values are in 'lbls',
     replacing all other values with 0.
     Uses GPU acceleration if available and requested.
+    The mask is not copied when already C-contiguous.
+
+    With numba installed (the 'numba' extra), int32 masks with up to 8 labels
+    use a compiled CPU kernel. Its first call pays a one-off JIT compilation
+    (about 0.4 s with a cold cache); later calls and runs reuse the cache.
 
     Returns:
         np.ndarray: The filtered mask (always a NumPy array).
     """
-    if not use_gpu or not _cupy_available:
+    if not use_gpu or not _load_cupy():
         warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
-        xp_local = np
+        mask = _prepare(np, mask)
+        lbls = _representable_labels(mask.dtype, lbls)
+        if (_numba_available
+                and mask.dtype == np.int32
+                and len(lbls) <= _NUMBA_FILTER_MAX_LABELS):
+            filtered_mask = np.empty_like(mask)
+            _filter_mask_numba(mask.ravel(), np.asarray(lbls, dtype=np.int32), filtered_mask.ravel())
+            return filtered_mask
+        return _filter_labels(np, mask, lbls)
     else:
-        xp_local = cp
+        with _gpu_stream():
+            mask = _prepare(cp, _to_gpu(mask))
+            lbls = _representable_labels(mask.dtype, lbls)
+            if mask.dtype == cp.int32:
+                return _ensure_numpy(_filter_mask_gpu_int32(mask, lbls))
+            return _ensure_numpy(_filter_labels(cp, mask, lbls))
 
-    mask = xp_local.asarray(mask)
-    max_val = int(mask.max())
-    lut = xp_local.zeros(max_val + 1, dtype=mask.dtype)
-    for l in lbls:
-        if l <= max_val:
-            lut[l] = l
-    filtered_mask = lut[mask]
 
-    return _ensure_numpy(filtered_mask)
+def filter_mask_(mask: np.ndarray, lbls: list, use_gpu: bool = True) -> np.ndarray:
+    """
+    In-place variant of filter_mask: values of 'mask' not in 'lbls' are set to 0
+    directly in 'mask', which must be a NumPy array. CuPy arrays are always
+    processed on the GPU without leaving the device.
+
+    Returns:
+        np.ndarray: 'mask', holding the filtered values.
+    """
+    if _is_gpu_array(mask):
+        stream = _gpu_stream()
+        with stream:
+            lbls = _representable_labels(mask.dtype, lbls)
+            if mask.dtype == cp.int32 and mask.flags.c_contiguous:
+                _filter_mask_gpu_int32(mask, lbls, out=mask)
+            else:
+                _filter_labels_(cp, mask, lbls)
+        _release_to_caller(stream)
+        return mask
+    if not isinstance(mask, np.ndarray):
+        raise TypeError("mask must be a NumPy or CuPy array.")
+
+    if not use_gpu or not _load_cupy():
+        warnings.warn("GPU is not available or not requested. Using CPU for calculations.")
+        lbls = _representable_labels(mask.dtype, lbls)
+        if (_numba_available
+                and mask.dtype == np.int32
+                and mask.flags.c_contiguous
+                and len(lbls) <= _NUMBA_FILTER_MAX_LABELS):
+            flat = mask.ravel()
+            _filter_mask_numba(flat, np.asarray(lbls, dtype=np.int32), flat)
+        else:
+            _filter_labels_(np, mask, lbls)
+        return mask
+    else:
+        mask[...] = filter_mask(mask, lbls, use_gpu=True)
+        return mask
@@ -4,15 +4,52 @@ from optimed.wrappers.calculations import (
     _cupy_available,
     scipy_label,
     scipy_binary_dilation,
+    scipy_binary_dilation_,
+    DilationOpts,
     scipy_binary_closing,
     scipy_binary_erosion,
     scipy_distance_transform_edt,
     scipy_minimum,
     scipy_sum,
-    filter_mask
+    filter_mask,
+    filter_mask_
 )
 
-class TestArrayFunctions(unittest.TestCase):
+# Shared read-only fixtures; tests that need to modify them must copy first.
+_INPUT_ARR = np.array([
+    [3, 4, 5],
+    [7, 1, 2],
+    [9, 8, 6]
+], dtype=np.int32)
+_LABEL_ARR = np.array([
+    [1, 1, 2],
+    [1, 1, 2],
+    [2, 2, 2]
+], dtype=np.int32)
+_MASK = np.array([
+    [0, 1, 2],
+    [3, 0, 4],
+    [5, 1, 1]
+], dtype=np.int32)
+_DILATE_IN = np.zeros((5, 5), dtype=bool)
+_DILATE_IN[2, 2] = True  # center pixel True
+_STRUCT = np.ones((3, 3), dtype=bool)
+
+for _arr in (_INPUT_ARR, _LABEL_ARR, _MASK, _DILATE_IN, _STRUCT):
+    _arr.setflags(write=False)
+
+
+def _bool_equal(a: np.ndarray, b: np.ndarray) -> bool:
+    """Exact comparison of boolean arrays with a single XOR + any reduction."""
+    return a.shape == b.shape and a.dtype == b.dtype and not np.any(a ^ b)
+
+
+def _int_equal(a: np.ndarray, b: np.ndarray) -> bool:
+    """Exact comparison of integer arrays, including dtype."""
+    return a.shape == b.shape and a.dtype == b.dtype and not (a != b).any()
+
+
+class TestArrayFunctionsCPU(unittest.TestCase):
 
     # ---------------------------
     # Tests for scipy_label
@@ -28,8 +65,7 @@ class TestArrayFunctions(unittest.TestCase):
         labeled, num_labels = scipy_label(input_array, use_gpu=False)
         self.assertEqual(num_labels, 3, f"Expected 3 labels, got {num_labels}")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_label.")
-    def test_scipy_label_gpu(self):
+    def test_scipy_label_cpu_full_connectivity(self):
         input_array = np.array([
             [0, 1, 1, 0],
             [1, 1, 0, 0],
@@ -37,32 +73,65 @@ class TestArrayFunctions(unittest.TestCase):
             [0, 0, 0, 1]
         ], dtype=bool)
 
-        labeled, num_labels = scipy_label(input_array, use_gpu=True)
-        self.assertEqual(num_labels, 3, f"GPU: Expected 3 labels, got {num_labels}")
+        labeled, num_labels = scipy_label(input_array, structure=_STRUCT, use_gpu=False)
+        self.assertEqual(num_labels, 1, f"Expected 1 label with 8-connectivity, got {num_labels}")
+        self.assertTrue(np.array_equal(labeled, input_array.astype(np.int32)), "8-connected labeling is incorrect.")
+
+    def test_scipy_label_invalid_backend(self):
+        input_array = np.zeros((4, 4), dtype=bool)
+        with self.assertRaises(ValueError):
+            scipy_label(input_array, use_gpu=False, backend="unknown")
 
     # ---------------------------
     # Tests for scipy_binary_dilation
     # ---------------------------
     def test_scipy_binary_dilation_cpu(self):
-        input_array = np.zeros((5, 5), dtype=bool)
-        input_array[2, 2] = True  # center pixel True
-        structure = np.ones((3, 3), dtype=bool)
-
-        dilated = scipy_binary_dilation(input_array, structure=structure, iterations=1, use_gpu=False)
+        dilated = scipy_binary_dilation(_DILATE_IN, structure=_STRUCT, iterations=1, use_gpu=False)
         expected = np.zeros((5, 5), dtype=bool)
         expected[1:4, 1:4] = True
-        self.assertTrue(np.array_equal(dilated, expected), "CPU binary_dilation did not match expected 3x3 block.")
+        self.assertTrue(_bool_equal(dilated, expected), "CPU binary_dilation did not match expected 3x3 block.")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_binary_dilation.")
-    def test_scipy_binary_dilation_gpu(self):
-        input_array = np.zeros((5, 5), dtype=bool)
-        input_array[2, 2] = True
-        structure = np.ones((3, 3), dtype=bool)
+    def test_scipy_binary_dilation_cpu_inplace(self):
+        for structure in (_STRUCT, np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=bool)):
+            input_array = _DILATE_IN.copy()
+            expected = scipy_binary_dilation(_DILATE_IN, structure=structure, use_gpu=False)
+            dilated = scipy_binary_dilation_(input_array, structure=structure, use_gpu=False)
+            self.assertIs(dilated, input_array)
+            self.assertTrue(_bool_equal(input_array, expected), "CPU in-place binary_dilation is incorrect.")
 
-        dilated = scipy_binary_dilation(input_array, structure=structure, iterations=1, use_gpu=True)
+    def test_scipy_binary_dilation_cpu_opts(self):
+        opts = DilationOpts(_STRUCT, 1, False)
+        dilated = scipy_binary_dilation(_DILATE_IN, opts)
         expected = np.zeros((5, 5), dtype=bool)
         expected[1:4, 1:4] = True
-        self.assertTrue(np.array_equal(dilated, expected), "GPU binary_dilation did not match expected 3x3 block.")
+        self.assertTrue(_bool_equal(dilated, expected), "CPU binary_dilation with DilationOpts did not match expected 3x3 block.")
+
+    def test_scipy_binary_dilation_cpu_wide_rows(self):
+        # Set pixels next to the 64-bit word boundaries of the packed rows.
+        input_array = np.zeros((6, 130), dtype=bool)
+        input_array[0, 63] = True
+        input_array[3, 64] = True
+        input_array[5, 129] = True
+
+        dilated = scipy_binary_dilation(input_array, structure=_STRUCT, iterations=2, use_gpu=False)
+        expected = np.zeros((6, 130), dtype=bool)
+        expected[0:3, 61:66] = True
+        expected[1:6, 62:67] = True
+        expected[3:6, 127:130] = True
+        self.assertTrue(_bool_equal(dilated, expected), "CPU binary_dilation across word boundaries is incorrect.")
+
+    def test_scipy_binary_dilation_cpu_large_structure(self):
+        from scipy.ndimage import binary_dilation
+        rng = np.random.default_rng(0)
+        input_array = rng.random((40, 40)) > 0.97
+        box = np.ones((15, 15), dtype=bool)
+        disk = np.hypot(*np.mgrid[-8:9, -8:9]) <= 8
+
+        for structure in (box, disk):
+            for iterations in (1, 3):
+                dilated = scipy_binary_dilation(input_array, structure=structure, iterations=iterations, use_gpu=False)
+                expected = binary_dilation(input_array, structure, iterations)
+                self.assertTrue(_bool_equal(dilated, expected), "CPU FFT binary_dilation did not match scipy.")
 
     # ---------------------------
     # Tests for scipy_binary_closing
@@ -74,8 +143,7 @@ class TestArrayFunctions(unittest.TestCase):
             [1, 0, 1],
             [0, 1, 0]
         ], dtype=bool)
-        structure = np.ones((3, 3), dtype=bool)
-        closed = scipy_binary_closing(input_array, structure=structure, iterations=1, use_gpu=False)
+        closed = scipy_binary_closing(input_array, structure=_STRUCT, iterations=1, use_gpu=False)
         # With default constant-padding, the dilation fills the array, but erosion only keeps the center.
         expected = np.array([
             [False, False, False],
@@ -84,22 +152,6 @@ class TestArrayFunctions(unittest.TestCase):
         ], dtype=bool)
         self.assertTrue(np.array_equal(closed, expected), "CPU binary_closing did not match expected result.")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_binary_closing.")
-    def test_scipy_binary_closing_gpu(self):
-        input_array = np.array([
-            [0, 1, 0],
-            [1, 0, 1],
-            [0, 1, 0]
-        ], dtype=bool)
-        structure = np.ones((3, 3), dtype=bool)
-        closed = scipy_binary_closing(input_array, structure=structure, iterations=1, use_gpu=True)
-        expected = np.array([
-            [False, False, False],
-            [False, True, False],
-            [False, False, False]
-        ], dtype=bool)
-        self.assertTrue(np.array_equal(closed, expected), "GPU binary_closing did not match expected result.")
-
     # ---------------------------
     # Tests for scipy_binary_erosion
     # ---------------------------
@@ -111,25 +163,11 @@ class TestArrayFunctions(unittest.TestCase):
             [1, 1, 1, 1],
             [0, 1, 1, 0]
         ], dtype=bool)
-        structure = np.ones((3, 3), dtype=bool)
-        eroded = scipy_binary_erosion(input_array, structure=structure, iterations=1, use_gpu=False)
+        eroded = scipy_binary_erosion(input_array, structure=_STRUCT, iterations=1, use_gpu=False)
         # With default constant-padding, none of the pixels have a full 3x3 neighborhood of True.
         expected = np.zeros((4, 4), dtype=bool)
         self.assertTrue(np.array_equal(eroded, expected), "CPU binary_erosion did not match expected result.")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_binary_erosion.")
-    def test_scipy_binary_erosion_gpu(self):
-        input_array = np.array([
-            [0, 1, 1, 0],
-            [1, 1, 1, 1],
-            [1, 1, 1, 1],
-            [0, 1, 1, 0]
-        ], dtype=bool)
-        structure = np.ones((3, 3), dtype=bool)
-        eroded = scipy_binary_erosion(input_array, structure=structure, iterations=1, use_gpu=True)
-        expected = np.zeros((4, 4), dtype=bool)
-        self.assertTrue(np.array_equal(eroded, expected), "GPU binary_erosion did not match expected result.")
-
     # ---------------------------
     # Tests for scipy_distance_transform_edt
     # ---------------------------
@@ -149,121 +187,267 @@ class TestArrayFunctions(unittest.TestCase):
         # The center (2,2) should have a distance of 0.
         self.assertAlmostEqual(dist_trans[2, 2], 0.0, places=3, msg="Center point distance should be 0.")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_distance_transform_edt.")
-    def test_scipy_distance_transform_edt_gpu(self):
-        input_array = np.zeros((5, 5), dtype=bool)
-        input_array[2, :] = True
-        input_array[:, 2] = True
+    def test_scipy_distance_transform_edt_cpu_out_dtype(self):
+        input_array = np.ones((5, 5), dtype=bool)
+        input_array[2, 2] = False
 
-        dist_trans = scipy_distance_transform_edt(~input_array, use_gpu=True)
-        self.assertAlmostEqual(dist_trans[0, 0], 2.0, places=3)
-        self.assertAlmostEqual(dist_trans[2, 2], 0.0, places=3)
+        dist_trans = scipy_distance_transform_edt(input_array, use_gpu=False)
+        self.assertEqual(dist_trans.dtype, np.float32)
+        self.assertAlmostEqual(dist_trans[0, 0], np.sqrt(8), places=5)
+        dist_trans = scipy_distance_transform_edt(input_array, use_gpu=False, out_dtype=np.float64)
+        self.assertEqual(dist_trans.dtype, np.float64)
 
     # ---------------------------
     # Tests for scipy_minimum
     # ---------------------------
     def test_scipy_minimum_cpu(self):
-        input_array = np.array([
-            [3, 4, 5],
-            [7, 1, 2],
-            [9, 8, 6]
-        ], dtype=np.int32)
-        label_array = np.array([
-            [1, 1, 2],
-            [1, 1, 2],
-            [2, 2, 2]
-        ], dtype=np.int32)
-        min_val_region1 = scipy_minimum(input_array, label_array, 1, use_gpu=False)
-        min_val_region2 = scipy_minimum(input_array, label_array, 2, use_gpu=False)
+        min_val_region1 = scipy_minimum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=False)
+        min_val_region2 = scipy_minimum(_INPUT_ARR, _LABEL_ARR, 2, use_gpu=False)
         self.assertEqual(min_val_region1, 1, f"Expected min of 1 for region 1, got {min_val_region1}")
         self.assertEqual(min_val_region2, 2, f"Expected min of 2 for region 2, got {min_val_region2}")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_minimum.")
-    def test_scipy_minimum_gpu(self):
-        input_array = np.array([
-            [3, 4, 5],
-            [7, 1, 2],
-            [9, 8, 6]
-        ], dtype=np.int32)
-        label_array = np.array([
-            [1, 1, 2],
-            [1, 1, 2],
-            [2, 2, 2]
-        ], dtype=np.int32)
-        min_val_region1 = scipy_minimum(input_array, label_array, 1, use_gpu=True)
-        min_val_region2 = scipy_minimum(input_array, label_array, 2, use_gpu=True)
-        self.assertEqual(min_val_region1, 1)
-        self.assertEqual(min_val_region2, 2)
+    def test_scipy_minimum_cpu_batched(self):
+        min_vals = scipy_minimum(_INPUT_ARR, _LABEL_ARR, [1, 2], use_gpu=False)
+        self.assertEqual(list(min_vals), [1, 2], f"Expected minima [1, 2], got {min_vals}")
 
     # ---------------------------
     # Tests for scipy_sum
     # ---------------------------
     def test_scipy_sum_cpu(self):
-        input_array = np.array([
-            [3, 4, 5],
-            [7, 1, 2],
-            [9, 8, 6]
-        ], dtype=np.int32)
-        label_array = np.array([
-            [1, 1, 2],
-            [1, 1, 2],
-            [2, 2, 2]
-        ], dtype=np.int32)
-        sum_val_region1 = scipy_sum(input_array, label_array, 1, use_gpu=False)
-        sum_val_region2 = scipy_sum(input_array, label_array, 2, use_gpu=False)
+        sum_val_region1 = scipy_sum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=False)
+        sum_val_region2 = scipy_sum(_INPUT_ARR, _LABEL_ARR, 2, use_gpu=False)
         self.assertEqual(sum_val_region1, 15, f"Expected sum of 15 for region 1, got {sum_val_region1}")
         self.assertEqual(sum_val_region2, 30, f"Expected sum of 30 for region 2, got {sum_val_region2}")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for scipy_sum.")
-    def test_scipy_sum_gpu(self):
-        input_array = np.array([
-            [3, 4, 5],
-            [7, 1, 2],
-            [9, 8, 6]
-        ], dtype=np.int32)
-        label_array = np.array([
-            [1, 1, 2],
-            [1, 1, 2],
-            [2, 2, 2]
-        ], dtype=np.int32)
-        sum_val_region1 = scipy_sum(input_array, label_array, 1, use_gpu=True)
-        sum_val_region2 = scipy_sum(input_array, label_array, 2, use_gpu=True)
-        self.assertEqual(sum_val_region1, 15)
-        self.assertEqual(sum_val_region2, 30)
+    def test_scipy_sum_cpu_sparse_labels(self):
+        label_array = np.zeros((4, 4), dtype=np.int64)
+        label_array[0, 0] = 2_000_000_000
+        input_array = np.ones((4, 4), dtype=np.int32)
+        sum_vals = scipy_sum(input_array, label_array, [0, 2_000_000_000, 10**12], use_gpu=False)
+        self.assertEqual(list(sum_vals), [15, 1, 0], f"Expected sums [15, 1, 0], got {sum_vals}")
+        sum_val = scipy_sum(input_array, label_array, 10**12, use_gpu=False)
+        self.assertEqual(sum_val, 0, f"Expected sum of 0 for a missing label, got {sum_val}")
+
+    def test_scipy_sum_cpu_batched(self):
+        sum_vals = scipy_sum(_INPUT_ARR, _LABEL_ARR, [1, 2], use_gpu=False)
+        self.assertEqual(list(sum_vals), [15, 30], f"Expected sums [15, 30], got {sum_vals}")
 
     # ---------------------------
     # Tests for filter_mask
     # ---------------------------
     def test_filter_mask_cpu(self):
-        mask = np.array([
-            [0, 1, 2],
-            [3, 0, 4],
-            [5, 1, 1]
-        ], dtype=np.int32)
         lbls_to_keep = [1, 5]
-        filtered = filter_mask(mask, lbls_to_keep, use_gpu=False)
+        filtered = filter_mask(_MASK, lbls_to_keep, use_gpu=False)
         expected = np.array([
             [0, 1, 0],
             [0, 0, 0],
             [5, 1, 1]
         ], dtype=np.int32)
-        self.assertTrue(np.array_equal(filtered, expected), "filter_mask CPU result is incorrect.")
+        self.assertTrue(_int_equal(filtered, expected), "filter_mask CPU result is incorrect.")
 
-    @unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU test for filter_mask.")
-    def test_filter_mask_gpu(self):
+    def test_filter_mask_cpu_inplace(self):
+        for lbls_to_keep in ([1, 5], [1, 5, 6, 7, 8, 9, 10, 11, 12]):
+            mask = _MASK.copy()
+            filtered = filter_mask_(mask, lbls_to_keep, use_gpu=False)
+            expected = np.array([
+                [0, 1, 0],
+                [0, 0, 0],
+                [5, 1, 1]
+            ], dtype=np.int32)
+            self.assertIs(filtered, mask)
+            self.assertTrue(_int_equal(mask, expected), "filter_mask_ CPU result is incorrect.")
+
+    def test_filter_mask_cpu_out_of_range_labels(self):
+        mask = np.array([
+            [0, 1, 2],
+            [44, 3, 4]
+        ], dtype=np.uint8)
+        # 300 does not fit in uint8 and must not wrap around to 44.
+        filtered = filter_mask(mask, [300, 1, 2, 3, 4], use_gpu=False)
+        expected = np.array([
+            [0, 1, 2],
+            [0, 3, 4]
+        ], dtype=np.uint8)
+        self.assertTrue(_int_equal(filtered, expected), "filter_mask CPU result with out-of-range labels is incorrect.")
+        filter_mask_(mask, [300, 1, 2, 3, 4], use_gpu=False)
+        self.assertTrue(_int_equal(mask, expected), "filter_mask_ CPU result with out-of-range labels is incorrect.")
+
+    def test_filter_mask_cpu_inplace_negative_labels(self):
+        mask = np.array([
+            [-1, 1, 2],
+            [3, -1, 4]
+        ], dtype=np.int16)
+        filter_mask_(mask, [-1, 2, 4], use_gpu=False)
+        expected = np.array([
+            [-1, 0, 2],
+            [0, -1, 4]
+        ], dtype=np.int16)
+        self.assertTrue(_int_equal(mask, expected), "filter_mask_ CPU result with negative labels is incorrect.")
+
+    def test_filter_mask_cpu_many_labels(self):
         mask = np.array([
             [0, 1, 2],
             [3, 0, 4],
-            [5, 1, 1]
+            [5, 6, 7]
         ], dtype=np.int32)
+        lbls_to_keep = [1, 2, 4, 6, 7, 100]
+        filtered = filter_mask(mask, lbls_to_keep, use_gpu=False)
+        expected = np.array([
+            [0, 1, 2],
+            [0, 0, 4],
+            [0, 6, 7]
+        ], dtype=np.int32)
+        self.assertTrue(_int_equal(filtered, expected), "filter_mask CPU result with many labels is incorrect.")
+
+
+@unittest.skipUnless(_cupy_available, "cupy not installed. Skipping GPU tests.")
+class TestArrayFunctionsGPU(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Pay CUDA context creation and kernel compilation once for all GPU tests.
+        import cupy as cp
+        cp.cuda.Device(0).use()
+        _ = cp.asarray(np.zeros((2, 2), dtype=bool))
+        scipy_label(_DILATE_IN, use_gpu=True)
+        scipy_binary_dilation(_DILATE_IN, structure=_STRUCT, use_gpu=True)
+        scipy_distance_transform_edt(_DILATE_IN, use_gpu=True)
+        scipy_minimum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=True)
+        scipy_sum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=True)
+        filter_mask(_MASK, [1], use_gpu=True)
+        cp.cuda.Device().synchronize()
+
+    # ---------------------------
+    # Tests for scipy_label
+    # ---------------------------
+    def test_scipy_label_gpu(self):
+        input_array = np.array([
+            [0, 1, 1, 0],
+            [1, 1, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1]
+        ], dtype=bool)
+
+        labeled, num_labels = scipy_label(input_array, use_gpu=True)
+        self.assertEqual(num_labels, 3, f"GPU: Expected 3 labels, got {num_labels}")
+
+    def test_scipy_label_gpu_bke(self):
+        input_array = np.array([
+            [0, 1, 1, 0, 0],
+            [1, 1, 0, 0, 1],
+            [0, 0, 1, 0, 1],
+            [0, 0, 0, 1, 0],
+            [1, 0, 0, 0, 0]
+        ], dtype=bool)
+
+        rng = np.random.default_rng(0)
+        # Odd sizes spanning several 32x32 tiles exercise cross-tile merges.
+        for input_array in (input_array, rng.random((67, 93)) > 0.6):
+            labeled, num_labels = scipy_label(input_array, structure=_STRUCT, use_gpu=True, backend="bke")
+            expected, expected_num = scipy_label(input_array, structure=_STRUCT, use_gpu=False)
+            self.assertEqual(num_labels, expected_num, f"GPU BKE: Expected {expected_num} labels, got {num_labels}")
+            self.assertTrue(np.array_equal(labeled > 0, expected > 0), "GPU BKE foreground does not match input.")
+            # Labels must match scipy's up to a relabeling: each (bke, scipy)
+            # pair is unique per component, so no component is split or fused.
+            pairs = np.unique(np.stack([labeled[expected > 0], expected[expected > 0]]), axis=1)
+            self.assertEqual(pairs.shape[1], expected_num, "GPU BKE components do not match scipy's.")
+
+    def test_scipy_label_gpu_bke_empty(self):
+        labeled, num_labels = scipy_label(np.zeros((0, 5), dtype=bool), structure=_STRUCT, use_gpu=True, backend="bke")
+        self.assertEqual(num_labels, 0)
+        self.assertEqual(labeled.shape, (0, 5))
+
+    # ---------------------------
+    # Tests for scipy_binary_dilation
+    # ---------------------------
+    def test_scipy_binary_dilation_gpu(self):
+        dilated = scipy_binary_dilation(_DILATE_IN, structure=_STRUCT, iterations=1, use_gpu=True)
+        expected = np.zeros((5, 5), dtype=bool)
+        expected[1:4, 1:4] = True
+        self.assertTrue(_bool_equal(dilated, expected), "GPU binary_dilation did not match expected 3x3 block.")
+
+    # ---------------------------
+    # Tests for scipy_binary_closing
+    # ---------------------------
+    def test_scipy_binary_closing_gpu(self):
+        input_array = np.array([
+            [0, 1, 0],
+            [1, 0, 1],
+            [0, 1, 0]
+        ], dtype=bool)
+        closed = scipy_binary_closing(input_array, structure=_STRUCT, iterations=1, use_gpu=True)
+        expected = np.array([
+            [False, False, False],
+            [False, True, False],
+            [False, False, False]
+        ], dtype=bool)
+        self.assertTrue(np.array_equal(closed, expected), "GPU binary_closing did not match expected result.")
+
+    # ---------------------------
+    # Tests for scipy_binary_erosion
+    # ---------------------------
+    def test_scipy_binary_erosion_gpu(self):
+        input_array = np.array([
+            [0, 1, 1, 0],
+            [1, 1, 1, 1],
+            [1, 1, 1, 1],
+            [0, 1, 1, 0]
+        ], dtype=bool)
+        eroded = scipy_binary_erosion(input_array, structure=_STRUCT, iterations=1, use_gpu=True)
+        expected = np.zeros((4, 4), dtype=bool)
+        self.assertTrue(np.array_equal(eroded, expected), "GPU binary_erosion did not match expected result.")
+
+    # ---------------------------
+    # Tests for scipy_distance_transform_edt
+    # ---------------------------
+    def test_scipy_distance_transform_edt_gpu(self):
+        input_array = np.zeros((5, 5), dtype=bool)
+        input_array[2, :] = True
+        input_array[:, 2] = True
+
+        dist_trans = scipy_distance_transform_edt(~input_array, use_gpu=True)
+        self.assertAlmostEqual(dist_trans[0, 0], 2.0, places=3)
+        self.assertAlmostEqual(dist_trans[2, 2], 0.0, places=3)
+
+    def test_scipy_distance_transform_edt_gpu_approximate(self):
+        input_array = np.zeros((5, 5), dtype=bool)
+        input_array[2, :] = True
+        input_array[:, 2] = True
+
+        dist_trans = scipy_distance_transform_edt(~input_array, use_gpu=True, exact=False)
+        self.assertAlmostEqual(dist_trans[0, 0], 2.0, places=3)
+        self.assertAlmostEqual(dist_trans[2, 2], 0.0, places=3)
+
+    # ---------------------------
+    # Tests for scipy_minimum
+    # ---------------------------
+    def test_scipy_minimum_gpu(self):
+        min_val_region1 = scipy_minimum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=True)
+        min_val_region2 = scipy_minimum(_INPUT_ARR, _LABEL_ARR, 2, use_gpu=True)
+        self.assertEqual(min_val_region1, 1)
+        self.assertEqual(min_val_region2, 2)
+
+    # ---------------------------
+    # Tests for scipy_sum
+    # ---------------------------
+    def test_scipy_sum_gpu(self):
+        sum_val_region1 = scipy_sum(_INPUT_ARR, _LABEL_ARR, 1, use_gpu=True)
+        sum_val_region2 = scipy_sum(_INPUT_ARR, _LABEL_ARR, 2, use_gpu=True)
+        self.assertEqual(sum_val_region1, 15)
+        self.assertEqual(sum_val_region2, 30)
+
+    # ---------------------------
+    # Tests for filter_mask
+    # ---------------------------
+    def test_filter_mask_gpu(self):
         lbls_to_keep = [1, 5]
-        filtered = filter_mask(mask, lbls_to_keep, use_gpu=True)
+        filtered = filter_mask(_MASK, lbls_to_keep, use_gpu=True)
         expected = np.array([
             [0, 1, 0],
             [0, 0, 0],
             [5, 1, 1]
         ], dtype=np.int32)
-        self.assertTrue(np.array_equal(filtered, expected), "filter_mask GPU result is incorrect.")
+        self.assertTrue(_int_equal(filtered, expected), "filter_mask GPU result is incorrect.")
 
 
 if __name__ == '__main__':